@@ -1,8 +1,12 @@
 import streamlit as st
 from openai import OpenAI
 import os
-from typing import Literal
+from typing import Literal, Union
 from datetime import datetime
+from utils import engines
+from utils.engines import SUMMARY_DEFAULT_PROMPT
+from utils.transcript_index import TranscriptIndex
+from utils.lang_detect import detect_language, LANGUAGE_NAMES
 
 def init_session_state():
     """Initialize session state variables"""
@@ -18,91 +22,51 @@ def init_session_state():
         st.session_state['show_transcript'] = False
     if 'show_summary' not in st.session_state:
         st.session_state['show_summary'] = False
-
-def get_language_code(language: str) -> str:
-    """Get ISO language code from language name"""
-    return {
-        "한국어": "ko",
-        "영어": "en",
-        "스페인어": "es",
-        "프랑스어": "fr",
-        "독일어": "de",
-        "중국어": "zh",
-        "일본어": "ja"
-    }.get(language, "ko")  # 기본값을 'ko'로 변경
-
-def format_timestamps(words: list) -> str:
-    """Format timestamp data into readable text"""
-    formatted_text = []
-    for word in words:
-        start = float(word.start)
-        end = float(word.end)
-        formatted_text.append(
-            f"[{start:.2f} - {end:.2f}] {word.text}"
-        )
-    return "\n".join(formatted_text)
+    if 'transcript_index' not in st.session_state:
+        st.session_state['transcript_index'] = None
 
 def process_audio(
     client: OpenAI,
     audio_file,
     transcription_type: Literal["번역", "타임스탬프 적용"],
     language: str
-) -> str:
-    """Process audio file based on selected options"""
+) -> Union[str, TranscriptIndex]:
+    """Process audio file based on selected options, reporting errors in the page"""
     try:
-        language_code = get_language_code(language)
-        
-        # 한국어 음성을 영어로 번역하는 경우
-        if transcription_type == "번역" and language == "한국어":
-            response = client.audio.translations.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text"
-            )
-        # 타임스탬프가 필요한 경우
-        elif transcription_type == "타임스탬프 적용":
-            response = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="verbose_json",
-                timestamp_granularities=["word"],
-                language=language_code
-            )
-            return format_timestamps(response.words)
-        # 일반 전사의 경우
-        else:
-            response = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text",
-                language=language_code
-            )
-        
-        return response.text if hasattr(response, 'text') else str(response)
-
+        return engines.process_audio(client, audio_file, transcription_type, language)
     except Exception as e:
         st.error(f"음성 처리 중 오류가 발생했습니다: {str(e)}")
         return ""
 
 def generate_summary(client: OpenAI, transcript: str, prompt: str) -> str:
-    """Generate summary using OpenAI Chat API"""
+    """Generate summary using OpenAI Chat API, reporting errors in the page"""
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that specializes in summarizing meeting minutes in Korean."},
-                {"role": "user", "content": f"{prompt}\n\n{transcript}"}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
-        return response.choices[0].message.content
+        return engines.generate_summary(client, transcript, prompt)
+    except Exception as e:
+        st.error(f"요약 생성 중 오류가 발생했습니다: {str(e)}")
+        return ""
+
+def stream_summary(client: OpenAI, transcript: str, prompt: str) -> str:
+    """Render summary tokens as they arrive and return the completed summary
+
+    The streamed preview is cleared once the summary is complete (the editor shows it)
+    or when the stream fails, so a partial summary is never kept.
+    """
+    preview = st.empty()
+    try:
+        summary = preview.write_stream(engines.stream_summary(client, transcript, prompt))
     except Exception as e:
+        preview.empty()
         st.error(f"요약 생성 중 오류가 발생했습니다: {str(e)}")
         return ""
+    preview.empty()
+    return summary if isinstance(summary, str) else "".join(summary)
 
 def render_download_buttons(transcript: str = None, summary: str = None):
-    """Render download buttons for transcript and summary"""
+    """Render download buttons for transcript and summary
+
+    The transcript is only sent to the browser when its button is clicked.
+    """
     current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     col1, col2 = st.columns(2)
@@ -111,7 +75,7 @@ def render_download_buttons(transcript: str = None, summary: str = None):
         if transcript:
             st.download_button(
                 label="전체 텍스트 다운로드",
-                data=transcript,
+                data=lambda: transcript,
                 file_name=f"transcript_{current_time}.txt",
                 mime="text/plain",
                 key=f"download_transcript_{current_time}"
@@ -127,6 +91,76 @@ def render_download_buttons(transcript: str = None, summary: str = None):
                 key=f"download_summary_{current_time}"
             )
 
+def _seek_transcript(index: TranscriptIndex, page_size: int):
+    """Jump to the page containing the requested time"""
+    position = index.locate(st.session_state['transcript_seek'])
+    st.session_state['transcript_page'] = position // page_size + 1
+
+def _jump_to_match(page_size: int):
+    """Jump to the page containing the selected search match"""
+    position = st.session_state['transcript_match']
+    if position is not None:
+        st.session_state['transcript_page'] = position // page_size + 1
+
+def _select_language(language: str):
+    """Apply the suggested language when the user accepts it"""
+    st.session_state['stt2_language'] = language
+
+def render_transcript_viewer(index: TranscriptIndex):
+    """Render one page of word timestamps with time seek, search and lazy export"""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        page_size = st.selectbox("페이지당 단어 수", (100, 200, 500), key="transcript_page_size")
+    page_count = index.page_count(page_size)
+    if st.session_state.get('transcript_page', 1) > page_count:
+        st.session_state['transcript_page'] = page_count
+    with col2:
+        st.number_input(
+            f"이동할 시간(초) / 전체 {index.duration:.0f}초",
+            min_value=0.0,
+            max_value=max(index.duration, 0.0),
+            step=10.0,
+            key="transcript_seek",
+            on_change=_seek_transcript,
+            args=(index, page_size)
+        )
+    with col3:
+        query = st.text_input("단어 검색", key="transcript_query")
+
+    if query:
+        matches = index.search(query)
+        st.caption(f"검색 결과: {len(matches)}개")
+        if len(matches):
+            # 선택 목록에는 앞쪽 결과만 표시
+            st.selectbox(
+                "검색 위치로 이동",
+                [None] + matches[:200].tolist(),
+                format_func=lambda i: "선택" if i is None else f"{index.starts[i]:.2f}초 - {index.words[i]}",
+                key="transcript_match",
+                on_change=_jump_to_match,
+                args=(page_size,)
+            )
+
+    page = st.number_input(
+        f"페이지 (전체 {page_count}쪽)",
+        min_value=1,
+        max_value=page_count,
+        step=1,
+        key="transcript_page"
+    )
+    st.text("\n".join(index.page(int(page), page_size)))
+
+    # The export is only generated when the download button is clicked
+    export_format = st.selectbox("내보내기 형식", ("txt", "srt", "vtt"), format_func=str.upper)
+    current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+    st.download_button(
+        label="타임스탬프 파일 다운로드",
+        data=lambda: index.export(export_format),
+        file_name=f"transcript_{current_time}.{export_format}",
+        mime="text/vtt" if export_format == "vtt" else "text/plain",
+        key="download_timestamps"
+    )
+
 def render_page():
     """Main page rendering function"""
     st.header("STT (음성 → 텍스트) 및 회의록 생성 서비스")
@@ -143,11 +177,13 @@ def render_page():
         type=["mp3", "wav", "m4a", "mp4", "mpeg", "mpga", "webm"]
     )
     
-    # Language selection with Korean as default
+    # Language selection
+    languages = ("한국어", "영어", "스페인어", "프랑스어", "독일어", "중국어", "일본어")
     language = st.selectbox(
         "변환할 언어를 선택하세요:",
-        ("한국어", "영어", "스페인어", "프랑스어", "독일어", "중국어", "일본어"),
-        index=0  # 한국어를 기본값으로 설정
+        languages,
+        index=0,  # 한국어를 기본값으로 설정
+        key="stt2_language"
     )
     
     # Transcription type selection
@@ -160,63 +196,106 @@ def render_page():
     # Process audio file
     if uploaded_file and st.button("텍스트로 변환"):
         with st.spinner("음성을 변환하는 중..."):
-            st.session_state['transcript_text'] = process_audio(
+            result = process_audio(
                 client,
                 uploaded_file,
                 transcription_type,
                 language
             )
+            if isinstance(result, TranscriptIndex):
+                st.session_state['transcript_index'] = result
+                st.session_state['transcript_page'] = 1
+                st.session_state['transcript_text'] = result.plain_text()
+            else:
+                st.session_state['transcript_index'] = None
+                st.session_state['transcript_text'] = result
             if st.session_state['transcript_text']:
                 st.session_state['transcript_edited'] = st.session_state['transcript_text']
                 st.session_state['show_transcript'] = True
 
+                # Translations are always English, so only hint for transcriptions
+                if transcription_type != "번역":
+                    detected = LANGUAGE_NAMES.get(detect_language(st.session_state['transcript_text'], default=None))
+                    st.session_state['detected_language'] = detected
+                else:
+                    st.session_state['detected_language'] = None
+
+    # The detected language is only suggested; the selection changes when the user accepts it
+    detected = st.session_state.get('detected_language')
+    if detected in languages and detected != language:
+        st.info(f"변환 결과가 {detected}로 감지되었습니다. 언어를 바꿔 다시 변환하면 더 정확할 수 있습니다.")
+        st.button(
+            f"변환 언어를 {detected}로 변경",
+            on_click=_select_language,
+            args=(detected,),
+            key="apply_detected_language"
+        )
+
     # Display and edit transcript
     if st.session_state['show_transcript']:
         st.subheader("변환된 텍스트")
-        st.session_state['transcript_edited'] = st.text_area(
-            "회의록 텍스트 (수정 가능):",
-            value=st.session_state['transcript_edited'],
-            height=200,
-            key="transcript_editor"
-        )
-        
+        if st.session_state['transcript_index']:
+            # Only the visible page of word timestamps is rendered; the plain words
+            # are sent to the browser only while the editor is switched on
+            render_transcript_viewer(st.session_state['transcript_index'])
+            show_editor = st.toggle("요약용 텍스트 편집 (타임스탬프 제외)", key="transcript_show_editor")
+        else:
+            show_editor = True
+
+        if show_editor:
+            st.session_state['transcript_edited'] = st.text_area(
+                "회의록 텍스트 (수정 가능):",
+                value=st.session_state['transcript_edited'],
+                height=200,
+                key="transcript_editor"
+            )
+
         render_download_buttons(st.session_state['transcript_edited'])
     
         # Summary generation
         st.subheader("회의록 요약 프롬프트 입력")
-        default_prompt = (
-            "다음 회의록을 회사 회의용 형식으로 요약하세요. "
-            "주요 논의 사항, 결정된 사항, 후속 작업을 포함해 정리해 주세요."
-        )
         user_prompt = st.text_area(
             "프롬프트 입력",
-            value=default_prompt,
+            value=SUMMARY_DEFAULT_PROMPT,
             height=100
         )
         
+        stream_output = st.checkbox(
+            "요약 결과 실시간 표시",
+            value=True,
+            help="생성되는 대로 요약 내용을 바로 보여줍니다. 같은 텍스트와 프롬프트의 요약본은 다시 생성하지 않습니다."
+        )
+
         if st.button("요약본 생성", key="generate_summary"):
-            with st.spinner("회의록 요약본을 생성하는 중..."):
-                st.session_state['summary_text'] = generate_summary(
+            if stream_output:
+                st.session_state['summary_text'] = stream_summary(
                     client,
                     st.session_state['transcript_edited'],
                     user_prompt
                 )
-                if st.session_state['summary_text']:
-                    st.session_state['summary_edited'] = st.session_state['summary_text']
-                    st.session_state['show_summary'] = True
+            else:
+                with st.spinner("회의록 요약본을 생성하는 중..."):
+                    st.session_state['summary_text'] = generate_summary(
+                        client,
+                        st.session_state['transcript_edited'],
+                        user_prompt
+                    )
+            if st.session_state['summary_text']:
+                st.session_state['summary_edited'] = st.session_state['summary_text']
+                # Replace the editor contents with the new summary
+                st.session_state['summary_editor'] = st.session_state['summary_text']
+                st.session_state['show_summary'] = True
 
     # Display and edit summary
     if st.session_state['show_summary']:
+        if 'summary_editor' not in st.session_state:
+            st.session_state['summary_editor'] = st.session_state['summary_edited']
         st.session_state['summary_edited'] = st.text_area(
             "요약본 (수정 가능):",
-            value=st.session_state['summary_edited'],
             height=150,
             key="summary_editor"
         )
-        render_download_buttons(
-            st.session_state['transcript_edited'],
-            st.session_state['summary_edited']
-        )
+        render_download_buttons(summary=st.session_state['summary_edited'])
     
     # Reset button with confirmation
     if st.button("처음으로"):
@@ -1,20 +1,15 @@
 import streamlit as st
-import speech_recognition as sr
 import os
-from pydub import AudioSegment
 import tempfile
 import soundfile as sf
 import numpy as np
+from utils import engines
+from utils.lang_detect import detect_language, LANGUAGE_NAMES
 
 def convert_audio_to_wav(input_path):
     """오디오 파일을 WAV 형식으로 변환"""
     try:
-        audio = AudioSegment.from_file(input_path)
-        wav_path = input_path.rsplit('.', 1)[0] + '.wav'
-        audio = audio.set_channels(1)  # 모노로 변환
-        audio = audio.set_frame_rate(16000)  # 샘플레이트 16kHz로 설정
-        audio.export(wav_path, format='wav')
-        return wav_path
+        return engines.convert_audio_to_wav(input_path)
     except Exception as e:
         st.error(f"오디오 변환 중 오류 발생: {str(e)}")
         raise
@@ -22,24 +17,7 @@ def convert_audio_to_wav(input_path):
 def convert_audio_to_text(file_path, language):
     """음성을 텍스트로 변환"""
     try:
-        r = sr.Recognizer()
-        # 환경 노이즈 조정
-        r.dynamic_energy_threshold = True
-        r.energy_threshold = 4000
-        
-        with sr.AudioFile(file_path) as source:
-            # 오디오 데이터 조정
-            r.adjust_for_ambient_noise(source, duration=0.5)
-            audio_data = r.record(source)
-            
-            # 음성 인식 시도
-            try:
-                text = r.recognize_google(audio_data, language=language)
-                return text
-            except sr.UnknownValueError:
-                raise Exception("음성을 인식할 수 없습니다. 다른 오디오 파일을 시도해주세요.")
-            except sr.RequestError as e:
-                raise Exception(f"Google API 요청 실패: {str(e)}")
+        return engines.convert_audio_to_text(file_path, language)
     except Exception as e:
         st.error(f"음성 인식 중 오류 발생: {str(e)}")
         raise
@@ -57,11 +35,13 @@ def render_page():
         type=["wav", "mp3", "m4a", "aac"]
     )
     
-    # 언어 선택
+    # 언어 선택 (이전 인식 결과에서 감지한 언어를 기본값으로 사용)
+    languages = ["한국어", "영어", "일본어"]
+    detected = st.session_state.get('stt_detected_language')
     language = st.selectbox(
         "언어 선택",
-        ["한국어", "영어", "일본어"],
-        index=0
+        languages,
+        index=languages.index(detected) if detected in languages else 0
     )
     
     lang_code = {
@@ -73,37 +53,44 @@ def render_page():
     temp_audio_path = None
     converted_wav_path = None
     
-    if audio_file is not None:
+    # 업로드 저장과 WAV 변환은 버튼을 눌렀을 때만 수행 (다른 위젯 변경 시 풀을 쓰지 않음)
+    if audio_file is not None and st.button("텍스트로 변환"):
         try:
-            # 임시 디렉토리에 파일 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(audio_file.name)[1]) as temp_audio:
-                temp_audio.write(audio_file.getbuffer())
-                temp_audio_path = temp_audio.name
-            
-            # WAV로 변환
-            converted_wav_path = convert_audio_to_wav(temp_audio_path)
-            
-            if st.button("텍스트로 변환"):
-                with st.spinner("음성을 텍스트로 변환하는 중입니다..."):
-                    try:
-                        # 음성 인식 실행
-                        text = convert_audio_to_text(converted_wav_path, lang_code[language])
-                        st.session_state.processed_text = text
-                        
-                        st.success("변환이 완료되었습니다!")
-                        st.write("변환 결과:")
-                        st.write(st.session_state.processed_text)
-                        
-                        # 텍스트가 있을 때만 다운로드 버튼 표시
-                        if st.session_state.processed_text:
-                            st.download_button(
-                                label="텍스트 파일 다운로드",
-                                data=st.session_state.processed_text,
-                                file_name="stt_output.txt",
-                                mime="text/plain"
-                            )
-                    except Exception as e:
-                        st.error(f"텍스트 변환 중 오류가 발생했습니다. 다른 파일을 시도해보세요: {str(e)}")
+            with st.spinner("음성을 텍스트로 변환하는 중입니다..."):
+                # 임시 디렉토리에 파일 저장
+                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(audio_file.name)[1]) as temp_audio:
+                    temp_audio.write(audio_file.getbuffer())
+                    temp_audio_path = temp_audio.name
+
+                # WAV로 변환
+                converted_wav_path = convert_audio_to_wav(temp_audio_path)
+
+                try:
+                    # 음성 인식 실행
+                    text = convert_audio_to_text(converted_wav_path, lang_code[language])
+                    st.session_state.processed_text = text
+                    
+                    st.success("변환이 완료되었습니다!")
+
+                    # 인식 결과의 언어가 선택한 언어와 다르면 안내 (선택 가능한 언어일 때만)
+                    detected = LANGUAGE_NAMES.get(detect_language(text, default=None))
+                    if detected in languages:
+                        st.session_state['stt_detected_language'] = detected
+                        if detected != language:
+                            st.info(f"인식 결과가 {detected}로 감지되었습니다. 언어를 바꿔 다시 변환하면 더 정확할 수 있습니다.")
+                    st.write("변환 결과:")
+                    st.write(st.session_state.processed_text)
+                    
+                    # 텍스트가 있을 때만 다운로드 버튼 표시
+                    if st.session_state.processed_text:
+                        st.download_button(
+                            label="텍스트 파일 다운로드",
+                            data=st.session_state.processed_text,
+                            file_name="stt_output.txt",
+                            mime="text/plain"
+                        )
+                except Exception as e:
+                    st.error(f"텍스트 변환 중 오류가 발생했습니다. 다른 파일을 시도해보세요: {str(e)}")
                         
         except Exception as e:
             st.error(f"파일 처리 중 오류가 발생했습니다: {str(e)}")
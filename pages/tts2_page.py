@@ -1,57 +1,19 @@
 import streamlit as st
-from gtts import gTTS
-import pyttsx3
-import tempfile
-import os
-from io import BytesIO
 from datetime import datetime
 import subprocess
-
-def get_pyttsx3_voices():
-    """사용 가능한 로컬 음성 목록 가져오기"""
-    engine = pyttsx3.init()
-    voices = engine.getProperty('voices')
-    return {f"local_{i}": voice for i, voice in enumerate(voices)}
+from utils import engines
+from utils.engines import get_pyttsx3_voices, text_to_speech_gtts
+from utils.lang_detect import IncrementalDetector, LANGUAGE_NAMES
+from utils.audio_cache import synthesis_key, has_audio, store_audio, get_audio, MIME_TYPES
 
 def text_to_speech_local(text, selected_voice, rate=150):
-    """pyttsx3를 사용하여 로컬 TTS 변환 후 파일로 저장"""
-    engine = pyttsx3.init()
-    voices = get_pyttsx3_voices()
-    
-    # 음성 설정
-    engine.setProperty('voice', voices[selected_voice].id)
-    engine.setProperty('rate', rate)
-    
-    # 임시 파일에 저장
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-        temp_filename = temp_file.name
-    engine.save_to_file(text, temp_filename)
-    engine.runAndWait()
-    
-    # ffmpeg를 사용하여 파일 변환 (호환성 문제 해결)
-    converted_filename = temp_filename.replace('.wav', '_converted.mp3')
+    """pyttsx3를 사용하여 로컬 TTS 변환 후 WAV 파일로 저장"""
     try:
-        subprocess.run(
-            ['ffmpeg', '-i', temp_filename, converted_filename],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        return engines.text_to_speech_local(text, selected_voice, rate)
     except subprocess.CalledProcessError as e:
         st.error("ffmpeg 변환 중 오류가 발생했습니다.")
         st.write(e.stderr.decode())
         return None
-    finally:
-        os.remove(temp_filename)  # 원본 임시 파일 삭제
-
-    return converted_filename
-
-def text_to_speech_gtts(text, lang='ko'):
-    """Google TTS를 사용하여 온라인 TTS 변환 후 메모리로 반환"""
-    tts = gTTS(text=text, lang=lang, slow=False)
-    audio_bytes = BytesIO()
-    tts.write_to_fp(audio_bytes)
-    return audio_bytes.getvalue()
 
 def render_page():
     st.title("무료 TTS (텍스트 → 음성) 변환 서비스")
@@ -85,9 +47,15 @@ def render_page():
     
     with col1:
         if service_type == "Google TTS (온라인)":
+            # 입력 텍스트에서 감지한 언어를 기본값으로 선택
+            if not st.session_state.get('tts2_lang_detector'):
+                st.session_state['tts2_lang_detector'] = IncrementalDetector(default="ko")
+            detected = LANGUAGE_NAMES.get(st.session_state['tts2_lang_detector'].update(text_input))
+            lang_labels = list(gtts_languages.keys())
             selected_lang = st.selectbox(
                 "언어 선택:",
-                list(gtts_languages.keys())
+                lang_labels,
+                index=lang_labels.index(detected) if detected in lang_labels else 0
             )
             lang_code = gtts_languages[selected_lang]
         else:
@@ -107,6 +75,17 @@ def render_page():
                 help="숫자가 클수록 더 빠른 속도로 읽습니다."
             )
     
+    # 파일 형식 선택 (형식만 바꾸면 다시 합성하지 않고 변환만 수행)
+    output_format = st.selectbox(
+        "파일 형식:",
+        ["MP3", "WAV", "OGG"]
+    ).lower()
+
+    if service_type == "Google TTS (온라인)":
+        audio_key = synthesis_key("gtts", lang_code, text_input)
+    else:
+        audio_key = synthesis_key("local", selected_voice, rate, text_input)
+
     if st.button("음성 변환 시작"):
         if not text_input.strip():
             st.warning("텍스트를 입력해주세요.")
@@ -114,12 +93,12 @@ def render_page():
             
         try:
             with st.spinner("음성을 생성하는 중..."):
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                
-                if service_type == "Google TTS (온라인)":
+                if has_audio(audio_key):
+                    pass  # 이미 합성된 결과는 재사용
+                elif service_type == "Google TTS (온라인)":
                     try:
                         audio_bytes = text_to_speech_gtts(text_input, lang_code)
-                        output_format = "mp3"
+                        store_audio(audio_key, audio_bytes, source_format="mp3")
                     except Exception as e:
                         st.error(f"Google TTS 변환 중 오류가 발생했습니다: {str(e)}")
                         st.info("인터넷 연결을 확인하거나 Local TTS를 시도해보세요.")
@@ -128,32 +107,40 @@ def render_page():
                     try:
                         temp_file = text_to_speech_local(text_input, selected_voice, rate)
                         if temp_file:
-                            with open(temp_file, 'rb') as f:
-                                audio_bytes = f.read()
-                            output_format = "mp3"
-                            os.remove(temp_file)  # 변환된 임시 파일 삭제
+                            # 변환된 임시 파일은 캐시로 이동
+                            store_audio(audio_key, source_path=temp_file)
                         else:
                             st.error("로컬 TTS 파일 변환에 실패했습니다.")
                             return
                     except Exception as e:
                         st.error(f"Local TTS 변환 중 오류가 발생했습니다: {str(e)}")
                         return
-                
-                # 오디오 재생기 표시
-                st.audio(audio_bytes, format=f'audio/{output_format}')
-                
-                # 다운로드 버튼
-                st.download_button(
-                    label="음성 파일 다운로드",
-                    data=audio_bytes,
-                    file_name=f"tts_output_{timestamp}.{output_format}",
-                    mime=f"audio/{output_format}"
-                )
-                
+
+                st.session_state['tts2_audio_key'] = audio_key
                 st.success("음성 변환이 완료되었습니다!")
                 
         except Exception as e:
             st.error(f"음성 변환 중 오류가 발생했습니다: {str(e)}")
 
+    if st.session_state.get('tts2_audio_key') == audio_key and has_audio(audio_key):
+        try:
+            audio_bytes = get_audio(audio_key, output_format)
+        except Exception as e:
+            st.error(f"파일 형식 변환 중 오류가 발생했습니다: {str(e)}")
+            return
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # 오디오 재생기 표시
+        st.audio(audio_bytes, format=MIME_TYPES[output_format])
+
+        # 다운로드 버튼
+        st.download_button(
+            label="음성 파일 다운로드",
+            data=audio_bytes,
+            file_name=f"tts_output_{timestamp}.{output_format}",
+            mime=MIME_TYPES[output_format]
+        )
+
 if __name__ == "__main__":
     render_page()
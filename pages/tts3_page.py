@@ -1,7 +1,10 @@
 import streamlit as st
 import pyttsx3
 import base64
+import tempfile
 from datetime import datetime
+from utils.engines import pyttsx3_lock
+from utils.audio_cache import synthesis_key, has_audio, store_audio, get_audio, MIME_TYPES
 
 
 def render_page():
@@ -24,6 +27,9 @@ def render_page():
     # 음성 파일 형식 선택
     selected_format = st.selectbox("파일 형식을 선택하세요:", ["MP3", "WAV"]).lower()
 
+    # 같은 텍스트는 한 번만 합성하여 WAV 원본으로 보관하고, 형식은 변환만 수행
+    audio_key = synthesis_key("pyttsx3_female", prompt)
+
     # 음성 파일 생성 버튼
     if st.button("음성 파일 생성"):
         if not prompt or prompt == "여기에 텍스트를 입력하세요":
@@ -31,47 +37,62 @@ def render_page():
         else:
             with st.spinner("음성을 생성하는 중..."):
                 try:
-                    # Pyttsx3 초기화 및 설정 (여성 목소리 설정)
-                    engine = pyttsx3.init()
-                    voices = engine.getProperty('voices')
-                    for voice in voices:
-                        if "female" in voice.name.lower() or "female" in voice.id.lower():
-                            engine.setProperty('voice', voice.id)
-                            break
-
-                    # 파일명에 현재 시간 추가
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"tts_output_{timestamp}.{selected_format}"
-
-                    # 음성 파일 생성
-                    engine.save_to_file(prompt, filename)
-                    engine.runAndWait()
-
-                    # 생성된 음성을 브라우저에서 재생 및 다운로드 버튼 추가
-                    with open(filename, "rb") as audio_file:
-                        audio_bytes = audio_file.read()
-                        b64 = base64.b64encode(audio_bytes).decode()
-                        audio_player = f"""
-                            <audio controls="controls" style="width: 100%">
-                                <source src="data:audio/{selected_format};base64,{b64}" type="audio/{selected_format}">
-                                Your browser does not support the audio element.
-                            </audio>
-                            """
-                        st.markdown(audio_player, unsafe_allow_html=True)
-
-                        # 다운로드 버튼 추가
-                        st.download_button(
-                            label="음성 파일 다운로드",
-                            data=audio_bytes,
-                            file_name=filename,
-                            mime=f"audio/{selected_format}"
-                        )
+                    if not has_audio(audio_key):
+                        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+                            temp_filename = temp_file.name
+
+                        # 공유 엔진이므로 다른 세션과 겹치지 않게 잠금 후 합성
+                        with pyttsx3_lock:
+                            # Pyttsx3 초기화 및 설정 (여성 목소리 설정)
+                            engine = pyttsx3.init()
+                            voices = engine.getProperty('voices')
+                            for voice in voices:
+                                if "female" in voice.name.lower() or "female" in voice.id.lower():
+                                    engine.setProperty('voice', voice.id)
+                                    break
 
+                            # 임시 WAV 파일로 생성 후 캐시로 이동
+                            engine.save_to_file(prompt, temp_filename)
+                            engine.runAndWait()
+                        store_audio(audio_key, source_path=temp_filename)
+
+                    st.session_state['tts3_audio_key'] = audio_key
                     st.success("음성 파일 생성이 완료되었습니다!")
                 except Exception as e:
                     st.error("음성 파일을 생성하는 데 오류가 발생했습니다.")
                     st.write(e)
 
+    # 생성된 음성을 브라우저에서 재생 및 다운로드 버튼 추가
+    if st.session_state.get('tts3_audio_key') == audio_key and has_audio(audio_key):
+        try:
+            audio_bytes = get_audio(audio_key, selected_format)
+        except Exception as e:
+            st.error("파일 형식 변환 중 오류가 발생했습니다.")
+            st.write(e)
+            return
+
+        # 파일명에 현재 시간 추가
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"tts_output_{timestamp}.{selected_format}"
+        mime = MIME_TYPES[selected_format]
+
+        b64 = base64.b64encode(audio_bytes).decode()
+        audio_player = f"""
+            <audio controls="controls" style="width: 100%">
+                <source src="data:{mime};base64,{b64}" type="{mime}">
+                Your browser does not support the audio element.
+            </audio>
+            """
+        st.markdown(audio_player, unsafe_allow_html=True)
+
+        # 다운로드 버튼 추가
+        st.download_button(
+            label="음성 파일 다운로드",
+            data=audio_bytes,
+            file_name=filename,
+            mime=mime
+        )
+
 # Streamlit 페이지 실행
 def main():
     render_page()
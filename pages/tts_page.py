@@ -4,6 +4,8 @@ import openai
 from datetime import datetime
 from dotenv import load_dotenv
 import base64
+from utils.lang_detect import IncrementalDetector, LANGUAGE_NAMES
+from utils.audio_cache import synthesis_key, has_audio, store_audio, get_audio, MIME_TYPES
 
 load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
@@ -11,17 +13,11 @@ client = openai.OpenAI(api_key=api_key)
 
 def detect_language(text):
     """입력된 텍스트의 언어를 감지"""
-    # 간단한 언어 감지 로직
-    korean = sum(1 for c in text if ord('가') <= ord(c) <= ord('힣'))
-    english = sum(1 for c in text if ord('a') <= ord(c) <= ord('z') or ord('A') <= ord(c) <= ord('Z'))
-    japanese = sum(1 for c in text if ord('ぁ') <= ord(c) <= ord('ヿ'))
-    
-    if korean > english and korean > japanese:
-        return "한국어"
-    elif japanese > english and japanese > korean:
-        return "일본어"
-    else:
-        return "영어"
+    # 세션별 감지기가 이전 입력과 달라진 부분만 다시 셈
+    if not st.session_state.get('tts_lang_detector'):
+        st.session_state['tts_lang_detector'] = IncrementalDetector()
+    language = st.session_state['tts_lang_detector'].update(text)
+    return LANGUAGE_NAMES.get(language, "영어")
 
 def get_voice_recommendations(text):
     """텍스트 분석을 통한 음성 추천"""
@@ -102,6 +98,9 @@ def render_page():
                 help="고품질은 더 자연스럽지만 처리 시간이 깁니다"
             )
 
+    # 같은 텍스트/음성/품질은 한 번만 합성하여 WAV 원본으로 보관
+    audio_key = synthesis_key("openai", model, selected_voice, prompt)
+
     # 음성 생성 버튼
     if st.button("음성 파일 생성", type="primary"):
         if not prompt or prompt == "여기에 텍스트를 입력하세요":
@@ -109,44 +108,53 @@ def render_page():
         else:
             with st.spinner("음성을 생성하는 중..."):
                 try:
-                    response = client.audio.speech.create(
-                        model=model,
-                        voice=selected_voice,
-                        input=prompt,
-                        response_format=selected_format
-                    )
-                    
-                    audio_content = response.content
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"tts_output_{timestamp}.{selected_format}"
-
-                    # 결과 표시
-                    st.success("음성 생성 완료!")
-                    
-                    col5, col6 = st.columns(2)
-                    with col5:
-                        # 오디오 플레이어
-                        b64 = base64.b64encode(audio_content).decode()
-                        audio_player = f"""
-                            <audio controls="controls" style="width: 100%">
-                                <source src="data:audio/{selected_format};base64,{b64}" type="audio/{selected_format}">
-                                Your browser does not support the audio element.
-                            </audio>
-                            """
-                        st.markdown(audio_player, unsafe_allow_html=True)
-                    
-                    with col6:
-                        # 다운로드 버튼
-                        st.download_button(
-                            label="음성 파일 다운로드",
-                            data=audio_content,
-                            file_name=filename,
-                            mime=f"audio/{selected_format}",
-                            help="생성된 음성 파일을 다운로드합니다"
+                    if not has_audio(audio_key):
+                        response = client.audio.speech.create(
+                            model=model,
+                            voice=selected_voice,
+                            input=prompt,
+                            response_format="wav"
                         )
+                        store_audio(audio_key, response.content)
+                    st.session_state['tts_audio_key'] = audio_key
+                    st.success("음성 생성 완료!")
 
                 except Exception as e:
                     st.error(f"음성 생성 중 오류가 발생했습니다: {str(e)}")
 
+    # 결과 표시 (파일 형식만 바꾸면 원본에서 변환만 수행)
+    if st.session_state.get('tts_audio_key') == audio_key and has_audio(audio_key):
+        try:
+            audio_content = get_audio(audio_key, selected_format)
+        except Exception as e:
+            st.error(f"파일 형식 변환 중 오류가 발생했습니다: {str(e)}")
+            return
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"tts_output_{timestamp}.{selected_format}"
+        mime = MIME_TYPES[selected_format]
+
+        col5, col6 = st.columns(2)
+        with col5:
+            # 오디오 플레이어
+            b64 = base64.b64encode(audio_content).decode()
+            audio_player = f"""
+                <audio controls="controls" style="width: 100%">
+                    <source src="data:{mime};base64,{b64}" type="{mime}">
+                    Your browser does not support the audio element.
+                </audio>
+                """
+            st.markdown(audio_player, unsafe_allow_html=True)
+
+        with col6:
+            # 다운로드 버튼
+            st.download_button(
+                label="음성 파일 다운로드",
+                data=audio_content,
+                file_name=filename,
+                mime=mime,
+                help="생성된 음성 파일을 다운로드합니다"
+            )
+
 if __name__ == "__main__":
     render_page()
\ No newline at end of file
@@ -0,0 +1,191 @@
+import os
+import sys
+import time
+import json
+import wave
+import shutil
+import argparse
+import tempfile
+import threading
+import http.client
+from io import BytesIO
+from types import SimpleNamespace
+
+# 부하 테스트 중 만든 캐시는 임시 폴더에만 남김
+os.environ.setdefault("TTS_CACHE_DIR", tempfile.mkdtemp(prefix="ai_1_loadtest_"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service import Backends, create_server  # noqa: E402
+
+
+def _silent_wav(seconds=1.0, rate=16000):
+    """대체 엔진이 돌려줄 무음 WAV"""
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\0\0" * int(seconds * rate))
+    return buffer.getvalue()
+
+
+class FakeOpenAI:
+    """OpenAI 클라이언트 대체 구현 (응답마다 latency초 지연)"""
+
+    def __init__(self, latency):
+        wav_bytes = _silent_wav()
+
+        def speech_create(**kwargs):
+            time.sleep(latency)
+            return SimpleNamespace(content=wav_bytes)
+
+        def transcription_create(file, response_format, **kwargs):
+            file.read()
+            time.sleep(latency)
+            if response_format == "verbose_json":
+                words = [
+                    SimpleNamespace(word=f"단어{i}", start=i * 0.5, end=i * 0.5 + 0.4)
+                    for i in range(200)
+                ]
+                return SimpleNamespace(text=" ".join(w.word for w in words), words=words)
+            return "테스트 음성 인식 결과입니다."
+
+        def chat_create(stream=False, **kwargs):
+            tokens = ["회의 ", "요약: ", "주요 ", "논의 ", "사항 ", "정리"]
+            if not stream:
+                time.sleep(latency)
+                message = SimpleNamespace(content="".join(tokens))
+                return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+            def chunks():
+                for token in tokens:
+                    time.sleep(latency / len(tokens))
+                    delta = SimpleNamespace(content=token)
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+            return chunks()
+
+        self.audio = SimpleNamespace(
+            speech=SimpleNamespace(create=speech_create),
+            transcriptions=SimpleNamespace(create=transcription_create),
+            translations=SimpleNamespace(create=transcription_create)
+        )
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=chat_create))
+
+
+def fake_backends(latency):
+    """OpenAI 외 엔진(gTTS, pyttsx3, Google 인식)도 같은 지연의 대체 구현으로 교체"""
+    wav_bytes = _silent_wav()
+
+    def gtts(text, lang):
+        time.sleep(latency)
+        # MP3 그대로 저장/전송되므로 내용은 검사하지 않음
+        return wav_bytes
+
+    def local_tts(text, voice, rate):
+        time.sleep(latency)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
+            temp_file.write(wav_bytes)
+        return temp_file.name
+
+    def google_stt(wav_path, language):
+        time.sleep(latency)
+        return "테스트 음성 인식 결과입니다."
+
+    return Backends(client=FakeOpenAI(latency), gtts=gtts, local_tts=local_tts, google_stt=google_stt)
+
+
+def _requests(worker, index, audio_body, transcode):
+    """(method, path, body, headers) 요청 목록을 번갈아 생성 (텍스트는 매번 달라 캐시를 피함)
+
+    transcode가 True이면 WAV로 합성한 결과를 MP3로 변환하는 요청(ffmpeg 필요)도 포함.
+    """
+    tag = f"{worker}-{index}"
+    json_headers = {"Content-Type": "application/json"}
+    wav_headers = {"Content-Type": "audio/wav"}
+    requests = [
+        ("POST", "/v1/tts/openai",
+         json.dumps({"text": f"부하 테스트 문장 {tag}", "format": "wav"}).encode(), json_headers),
+        ("POST", "/v1/tts/gtts",
+         json.dumps({"text": f"부하 테스트 문장 {tag}", "format": "mp3"}).encode(), json_headers),
+        ("POST", "/v1/tts/local",
+         json.dumps({"text": f"부하 테스트 문장 {tag}", "format": "wav"}).encode(), json_headers),
+        ("POST", "/v1/stt/whisper?mode=timestamps&filename=test.wav", audio_body, wav_headers),
+        ("POST", "/v1/stt/google?filename=test.wav", audio_body, wav_headers),
+        ("POST", "/v1/summary",
+         json.dumps({"transcript": f"회의 내용 {tag}", "stream": True}).encode(), json_headers),
+        ("POST", "/v1/summary",
+         json.dumps({"transcript": f"회의 내용 {tag}"}).encode(), json_headers)
+    ]
+    if transcode:
+        requests.append(
+            ("POST", "/v1/tts/openai",
+             json.dumps({"text": f"부하 테스트 문장 {tag}", "format": "mp3"}).encode(), json_headers)
+        )
+    return requests[index % len(requests)]
+
+
+def run_worker(host, port, worker, count, audio_body, transcode, latencies, errors):
+    # 연결 하나를 재사용 (HTTP/1.1 keep-alive)
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    for i in range(count):
+        method, path, body, headers = _requests(worker, i, audio_body, transcode)
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대체 엔진을 붙인 서비스에 대한 부하 테스트")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="클라이언트당 요청 수")
+    parser.add_argument("--latency", type=float, default=0.2, help="대체 엔진 응답 지연(초)")
+    args = parser.parse_args(argv)
+
+    transcode = shutil.which("ffmpeg") is not None
+    if not transcode:
+        print("ffmpeg를 찾을 수 없어 형식 변환 요청은 제외합니다.", file=sys.stderr)
+
+    server = create_server("127.0.0.1", 0, fake_backends(args.latency), quiet=True)
+    host, port = server.server_address
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    audio_body = _silent_wav(seconds=5.0)
+    latencies, errors = [], []
+    workers = [
+        threading.Thread(
+            target=run_worker,
+            args=(host, port, worker, args.requests, audio_body, transcode, latencies, errors)
+        )
+        for worker in range(args.concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+    server.server_close()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"requests: {total}, errors: {len(errors)}, elapsed: {elapsed:.2f}s")
+    print(f"throughput: {total / elapsed:.1f} req/s")
+    if total:
+        for label, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            print(f"{label}: {latencies[min(total - 1, int(total * q))] * 1000:.1f} ms")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
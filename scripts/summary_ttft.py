@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import engines  # noqa: E402
+
+
+def _measure_stream(client, transcript, prompt):
+    """(첫 토큰까지 걸린 시간, 전체 완료 시간) 반환"""
+    started = time.perf_counter()
+    first = None
+    for _ in engines.stream_summary(client, transcript, prompt):
+        if first is None:
+            first = time.perf_counter() - started
+    return first, time.perf_counter() - started
+
+
+def _measure_blocking(client, transcript, prompt):
+    """스트리밍 없이 전체 응답을 기다린 시간 (이 시간이 지나야 첫 글자가 보임)"""
+    started = time.perf_counter()
+    engines.generate_summary(client, transcript, prompt)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="요약 스트리밍의 첫 토큰 지연(TTFT) 측정")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--transcript", default="회의 내용: 다음 분기 일정과 예산을 논의했습니다. " * 20)
+    parser.add_argument("--prompt", default=engines.SUMMARY_DEFAULT_PROMPT)
+    parser.add_argument("--fake", action="store_true", help="OpenAI 대신 대체 클라이언트 사용")
+    parser.add_argument("--latency", type=float, default=2.0, help="대체 클라이언트 응답 지연(초)")
+    args = parser.parse_args(argv)
+
+    if args.fake:
+        from loadtest import FakeOpenAI
+        client = FakeOpenAI(args.latency)
+    else:
+        from openai import OpenAI
+        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+    ttft, stream_total, blocking = [], [], []
+    for run in range(args.runs):
+        # 입력을 매번 바꿔 요약 캐시를 피함
+        transcript = f"{args.transcript}\n#{run}"
+        first, total = _measure_stream(client, transcript + " (stream)", args.prompt)
+        ttft.append(first)
+        stream_total.append(total)
+        blocking.append(_measure_blocking(client, transcript + " (blocking)", args.prompt))
+
+    print(f"runs: {args.runs}")
+    print(f"stream TTFT (median): {statistics.median(ttft) * 1000:.0f} ms")
+    print(f"stream total (median): {statistics.median(stream_total) * 1000:.0f} ms")
+    print(f"blocking wait (median): {statistics.median(blocking) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
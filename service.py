@@ -0,0 +1,537 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from dotenv import load_dotenv
+from gtts import gTTSError
+from openai import OpenAI, OpenAIError
+from utils import engines
+from utils.engines import SpeechEngineError
+from utils.audio_cache import synthesis_key, has_audio, store_audio, get_audio_path, open_audio, MIME_TYPES
+from utils.audio_pool import AudioPoolBusyError, FFmpegNotFoundError
+from utils.transcript_index import TranscriptIndex
+
+load_dotenv()
+
+# 요청/응답 본문을 나눠 읽고 쓰는 단위와 업로드 최대 크기
+CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("SERVICE_MAX_UPLOAD_BYTES", 200 * 1024 * 1024))
+
+WHISPER_MODES = {
+    "text": "텍스트",
+    "translate": "번역",
+    "timestamps": "타임스탬프 적용"
+}
+
+WHISPER_LANGUAGES = ("한국어", "영어", "스페인어", "프랑스어", "독일어", "중국어", "일본어")
+
+OPENAI_VOICES = ("alloy", "echo", "fable", "onyx", "nova", "shimmer")
+OPENAI_TTS_MODELS = ("tts-1", "tts-1-hd")
+EXPORT_FORMATS = ("txt", "srt", "vtt")
+# tts2_page의 음성 속도 슬라이더와 같은 범위
+LOCAL_RATE_RANGE = (50, 300)
+
+# 서버 쪽 사정으로 지금 처리할 수 없어 503으로 돌려줄 예외
+UNAVAILABLE_ERRORS = (AudioPoolBusyError, FFmpegNotFoundError)
+# 외부 엔진 실패로 보고 502로 돌려줄 예외
+UPSTREAM_ERRORS = (SpeechEngineError, OpenAIError, gTTSError, subprocess.CalledProcessError)
+
+UPLOAD_SUFFIXES = {
+    "audio/mpeg": ".mp3",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/mp4": ".m4a",
+    "audio/aac": ".aac",
+    "audio/webm": ".webm"
+}
+
+
+class ServiceError(Exception):
+    """HTTP 상태 코드와 함께 클라이언트에 전달할 오류"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Backends:
+    """서비스가 사용하는 엔진 모음 (부하 테스트 등에서는 대체 구현을 주입)"""
+
+    def __init__(self, client=None, gtts=None, local_tts=None, google_stt=None):
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.gtts = gtts or engines.text_to_speech_gtts
+        self.local_tts = local_tts or engines.text_to_speech_local
+        self.google_stt = google_stt or engines.convert_audio_to_text
+
+    @property
+    def client(self):
+        """OpenAI 클라이언트 (OpenAI를 쓰는 요청에서 처음 필요할 때 생성)"""
+        with self._client_lock:
+            if self._client is None:
+                api_key = os.getenv("OPENAI_API_KEY")
+                if not api_key:
+                    raise ServiceError(503, "OPENAI_API_KEY가 설정되지 않았습니다.")
+                self._client = OpenAI(api_key=api_key)
+            return self._client
+
+
+def describe_upstream_error(error):
+    """외부 엔진 예외를 클라이언트에 보낼 메시지로 변환"""
+    if isinstance(error, subprocess.CalledProcessError):
+        stderr = (error.stderr or b"").decode(errors="replace").strip()
+        detail = stderr.splitlines()[-1] if stderr else f"exit status {error.returncode}"
+        return f"ffmpeg 변환 중 오류가 발생했습니다: {detail}"
+    return f"{type(error).__name__}: {str(error)}"
+
+
+def require(value, name, kind, default=None):
+    """요청 값의 타입을 확인하고 맞지 않으면 400 오류 발생"""
+    if value is None:
+        return default
+    if kind is int:
+        if isinstance(value, bool):
+            raise ServiceError(400, f"{name}은(는) 정수여야 합니다.")
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ServiceError(400, f"{name}은(는) 정수여야 합니다.")
+    if not isinstance(value, kind):
+        raise ServiceError(400, f"{name}의 형식이 올바르지 않습니다.")
+    return value
+
+
+def whisper_language(language):
+    """한국어 이름 또는 ISO 코드를 process_audio가 받는 언어 이름으로 변환"""
+    if language in WHISPER_LANGUAGES:
+        return language
+    for label in WHISPER_LANGUAGES:
+        if engines.get_language_code(label) == language:
+            return label
+    raise ServiceError(400, f"지원하지 않는 언어입니다: {language}")
+
+
+def synthesize(backends, engine, text, fmt="mp3", voice=None, model="tts-1", lang="ko", rate=150):
+    """텍스트를 음성으로 합성하고 요청한 형식으로 캐시한 뒤 캐시 키 반환
+
+    캐시 키는 각 페이지와 같으므로 UI에서 만든 결과도 재사용됨.
+    """
+    if not text or not text.strip():
+        raise ServiceError(400, "text가 비어 있습니다.")
+    if fmt not in MIME_TYPES:
+        raise ServiceError(400, f"지원하지 않는 파일 형식입니다: {fmt}")
+
+    if engine == "openai":
+        voice = voice or "alloy"
+        if voice not in OPENAI_VOICES:
+            raise ServiceError(400, f"지원하지 않는 음성입니다: {voice}")
+        if model not in OPENAI_TTS_MODELS:
+            raise ServiceError(400, f"지원하지 않는 모델입니다: {model}")
+        key = synthesis_key("openai", model, voice, text)
+        if not has_audio(key):
+            response = backends.client.audio.speech.create(
+                model=model,
+                voice=voice,
+                input=text,
+                response_format="wav"
+            )
+            store_audio(key, response.content)
+    elif engine == "gtts":
+        key = synthesis_key("gtts", lang, text)
+        if not has_audio(key):
+            store_audio(key, backends.gtts(text, lang), source_format="mp3")
+    elif engine == "local":
+        voice = voice or "local_0"
+        if not voice.startswith("local_") or not voice[len("local_"):].isdigit():
+            raise ServiceError(400, f"로컬 음성은 local_<번호> 형식이어야 합니다: {voice}")
+        if not LOCAL_RATE_RANGE[0] <= rate <= LOCAL_RATE_RANGE[1]:
+            raise ServiceError(400, f"rate는 {LOCAL_RATE_RANGE[0]}~{LOCAL_RATE_RANGE[1]} 사이여야 합니다.")
+        key = synthesis_key("local", voice, rate, text)
+        if not has_audio(key):
+            temp_file = backends.local_tts(text, voice, rate)
+            store_audio(key, source_path=temp_file)
+    else:
+        raise ServiceError(404, f"알 수 없는 TTS 엔진입니다: {engine}")
+
+    get_audio_path(key, fmt)
+    return key
+
+
+def transcribe(backends, engine, audio_path, language=None, mode="text", export=None):
+    """음성 파일을 텍스트로 변환하여 dict(또는 export 지정 시 문자열)로 반환"""
+    if export is not None and export not in EXPORT_FORMATS:
+        raise ServiceError(400, f"지원하지 않는 내보내기 형식입니다: {export}")
+
+    if engine == "google":
+        wav_path = engines.convert_audio_to_wav(audio_path)
+        try:
+            return {"text": backends.google_stt(wav_path, language or "ko-KR")}
+        finally:
+            if wav_path != audio_path and os.path.exists(wav_path):
+                os.remove(wav_path)
+
+    if engine != "whisper":
+        raise ServiceError(404, f"알 수 없는 STT 엔진입니다: {engine}")
+    if mode not in WHISPER_MODES:
+        raise ServiceError(400, f"지원하지 않는 변환 옵션입니다: {mode}")
+
+    label = whisper_language(language or "한국어")
+    client = backends.client
+    with open(audio_path, "rb") as audio_file:
+        result = engines.process_audio(client, audio_file, WHISPER_MODES[mode], label)
+
+    if isinstance(result, TranscriptIndex):
+        if export:
+            return result.export(export)
+        return {
+            "text": result.plain_text(),
+            "words": [
+                {"start": start, "end": end, "word": word}
+                for start, end, word in zip(result.starts.tolist(), result.ends.tolist(), result.words)
+            ]
+        }
+    return {"text": result}
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """TTS/STT/요약 HTTP API (HTTP/1.1 keep-alive, 청크 단위 요청/응답 스트리밍)"""
+
+    protocol_version = "HTTP/1.1"
+
+    routes = {
+        ("GET", "/healthz"): "handle_health",
+        ("POST", "/v1/tts/openai"): "handle_tts",
+        ("POST", "/v1/tts/gtts"): "handle_tts",
+        ("POST", "/v1/tts/local"): "handle_tts",
+        ("POST", "/v1/stt/google"): "handle_stt",
+        ("POST", "/v1/stt/whisper"): "handle_stt",
+        ("POST", "/v1/summary"): "handle_summary"
+    }
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self.headers_sent = False
+        handler = self.routes.get((method, url.path))
+        try:
+            if handler is None:
+                raise ServiceError(404, f"알 수 없는 경로입니다: {url.path}")
+            getattr(self, handler)(url.path.rsplit("/", 1)[-1])
+        except ServiceError as e:
+            self.send_error_json(e.status, str(e))
+        except UNAVAILABLE_ERRORS as e:
+            self.send_error_json(503, str(e))
+        except UPSTREAM_ERRORS as e:
+            self.send_error_json(502, describe_upstream_error(e))
+        except Exception as e:
+            self.send_error_json(500, f"처리 중 오류가 발생했습니다: {str(e)}")
+
+    # ---- 요청 본문 ----
+
+    def stream_body(self, out):
+        """요청 본문을 메모리에 모으지 않고 CHUNK_SIZE 단위로 out에 기록"""
+        total = 0
+
+        def copy(length):
+            nonlocal total
+            total += length
+            if total > MAX_UPLOAD_BYTES:
+                raise ServiceError(413, "업로드 크기 제한을 초과했습니다.")
+            while length:
+                data = self.rfile.read(min(CHUNK_SIZE, length))
+                if not data:
+                    raise ServiceError(400, "요청 본문이 중간에 끊어졌습니다.")
+                out.write(data)
+                length -= len(data)
+
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                line = self.rfile.readline(1024)
+                try:
+                    size = int(line.split(b";")[0].strip() or b"0", 16)
+                except ValueError:
+                    raise ServiceError(400, "청크 크기 형식이 올바르지 않습니다.")
+                if size < 0:
+                    raise ServiceError(400, "청크 크기 형식이 올바르지 않습니다.")
+                if size == 0:
+                    # trailer 헤더는 무시
+                    while self.rfile.readline(1024) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                copy(size)
+                self.rfile.readline(1024)
+        else:
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                raise ServiceError(400, "Content-Length 형식이 올바르지 않습니다.")
+            copy(length)
+
+    def read_json(self):
+        buffer = BytesIO()
+        self.stream_body(buffer)
+        try:
+            body = json.loads(buffer.getvalue() or b"{}")
+        except ValueError:
+            raise ServiceError(400, "JSON 형식이 올바르지 않습니다.")
+        if not isinstance(body, dict):
+            raise ServiceError(400, "요청 본문은 JSON 객체여야 합니다.")
+        return body
+
+    # ---- 응답 ----
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.headers_sent = True
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message):
+        # 읽지 않은 요청 본문이 남아 있을 수 있으므로 연결을 닫음
+        self.close_connection = True
+        if self.headers_sent:
+            return
+        self.send_json(status, {"error": message})
+
+    def send_file(self, f, content_type):
+        """열린 파일을 전송 (캐시 정리로 경로가 지워져도 열린 파일은 끝까지 읽을 수 있음)"""
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+        self.end_headers()
+        self.headers_sent = True
+        shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+
+    def start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.headers_sent = True
+
+    def write_chunk(self, data):
+        if data:
+            self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+    def end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+
+    def abort_chunked(self):
+        """응답 도중 실패 시 종료 청크 없이 연결을 끊어 잘린 응답임을 알림"""
+        self.close_connection = True
+
+    # ---- 엔드포인트 ----
+
+    def handle_health(self, _):
+        self.send_json(200, {"status": "ok"})
+
+    def handle_tts(self, engine):
+        body = self.read_json()
+        fmt = require(body.get("format"), "format", str, "mp3").lower()
+        key = synthesize(
+            self.server.backends,
+            engine,
+            require(body.get("text"), "text", str, ""),
+            fmt=fmt,
+            voice=require(body.get("voice"), "voice", str),
+            model=require(body.get("model"), "model", str, "tts-1"),
+            lang=require(body.get("lang"), "lang", str, "ko"),
+            rate=require(body.get("rate"), "rate", int, 150)
+        )
+        with open_audio(key, fmt) as f:
+            self.send_file(f, MIME_TYPES[fmt])
+
+    def handle_stt(self, engine):
+        filename = self.query.get("filename", "")
+        suffix = os.path.splitext(filename)[1] or UPLOAD_SUFFIXES.get(
+            self.headers.get("Content-Type", "").split(";")[0].strip(), ".wav"
+        )
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_audio:
+            temp_audio_path = temp_audio.name
+        try:
+            with open(temp_audio_path, "wb") as temp_audio:
+                self.stream_body(temp_audio)
+            export = self.query.get("export")
+            result = transcribe(
+                self.server.backends,
+                engine,
+                temp_audio_path,
+                language=self.query.get("language"),
+                mode=self.query.get("mode", "text"),
+                export=export
+            )
+        finally:
+            os.remove(temp_audio_path)
+
+        if isinstance(result, str):
+            body = result.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/vtt; charset=utf-8" if export == "vtt" else "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.headers_sent = True
+            self.wfile.write(body)
+        else:
+            self.send_json(200, result)
+
+    def handle_summary(self, _):
+        body = self.read_json()
+        transcript = require(body.get("transcript"), "transcript", str, "")
+        prompt = require(body.get("prompt"), "prompt", str) or engines.SUMMARY_DEFAULT_PROMPT
+        stream = require(body.get("stream"), "stream", bool, False)
+        if not transcript.strip():
+            raise ServiceError(400, "transcript가 비어 있습니다.")
+
+        client = self.server.backends.client
+        if not stream:
+            try:
+                summary = engines.generate_summary(client, transcript, prompt)
+            except Exception as e:
+                raise ServiceError(502, describe_upstream_error(e))
+            if not summary:
+                raise ServiceError(502, "요약 결과가 비어 있습니다.")
+            self.send_json(200, {"summary": summary})
+            return
+
+        # 첫 토큰을 받은 뒤에 헤더를 보내야 상위 API 실패를 502로 돌려줄 수 있음
+        tokens = engines.stream_summary(client, transcript, prompt)
+        try:
+            first = next(tokens, None)
+        except Exception as e:
+            raise ServiceError(502, describe_upstream_error(e))
+        if first is None:
+            raise ServiceError(502, "요약 결과가 비어 있습니다.")
+
+        self.start_chunked("text/plain; charset=utf-8")
+        try:
+            self.write_chunk(first.encode("utf-8"))
+            for token in tokens:
+                self.write_chunk(token.encode("utf-8"))
+        except Exception as e:
+            self.log_error("summary stream aborted: %s", e)
+            self.abort_chunked()
+            return
+        self.end_chunked()
+
+
+def create_server(host, port, backends=None, quiet=False):
+    """요청마다 스레드를 두는 HTTP 서버 생성 (CPU 작업은 공유 프로세스 풀에서 처리)"""
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.backends = backends or Backends()
+    server.quiet = quiet
+    return server
+
+
+def _read_text(value, path):
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    return value or ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cho pro AI 음성 변환 서비스 (HTTP API / CLI)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="HTTP API 서버 실행")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--quiet", action="store_true", help="요청 로그 출력 안 함")
+
+    tts = commands.add_parser("tts", help="텍스트 → 음성")
+    tts.add_argument("--engine", choices=["openai", "gtts", "local"], default="openai")
+    tts.add_argument("--text")
+    tts.add_argument("--input", help="텍스트 파일 경로")
+    tts.add_argument("--voice")
+    tts.add_argument("--model", default="tts-1")
+    tts.add_argument("--lang", default="ko")
+    tts.add_argument("--rate", type=int, default=150)
+    tts.add_argument("--format", choices=sorted(MIME_TYPES), default="mp3")
+    tts.add_argument("-o", "--output", required=True)
+
+    stt = commands.add_parser("stt", help="음성 → 텍스트")
+    stt.add_argument("audio")
+    stt.add_argument("--engine", choices=["google", "whisper"], default="whisper")
+    stt.add_argument("--language", help="google: ko-KR 형식, whisper: 한국어 또는 ko")
+    stt.add_argument("--mode", choices=sorted(WHISPER_MODES), default="text")
+    stt.add_argument("--export", choices=["txt", "srt", "vtt"])
+
+    summary = commands.add_parser("summary", help="회의록 요약")
+    summary.add_argument("--transcript", required=True, help="텍스트 파일 경로")
+    summary.add_argument("--prompt", default=engines.SUMMARY_DEFAULT_PROMPT)
+    summary.add_argument("--stream", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = create_server(args.host, args.port, quiet=args.quiet)
+        print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    backends = Backends()
+    try:
+        if args.command == "tts":
+            key = synthesize(
+                backends,
+                args.engine,
+                _read_text(args.text, args.input),
+                fmt=args.format,
+                voice=args.voice,
+                model=args.model,
+                lang=args.lang,
+                rate=args.rate
+            )
+            with open_audio(key, args.format) as src, open(args.output, "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        elif args.command == "stt":
+            result = transcribe(backends, args.engine, args.audio, args.language, args.mode, args.export)
+            print(result if isinstance(result, str) else json.dumps(result, ensure_ascii=False, indent=2))
+        elif args.command == "summary":
+            transcript = _read_text(None, args.transcript)
+            if args.stream:
+                for token in engines.stream_summary(backends.client, transcript, args.prompt):
+                    print(token, end="", flush=True)
+                print()
+            else:
+                print(engines.generate_summary(backends.client, transcript, args.prompt))
+    except (ServiceError, *UNAVAILABLE_ERRORS) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    except UPSTREAM_ERRORS as e:
+        print(describe_upstream_error(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
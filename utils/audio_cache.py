@@ -0,0 +1,175 @@
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+from utils.audio_pool import run_in_pool, transcode
+
+# 합성 결과는 엔진이 만든 형식(가능하면 무손실 WAV) 그대로 한 번만 저장하고,
+# 다른 형식은 요청 시 변환하여 함께 보관
+CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ai_1_tts_cache"))
+CANONICAL_FORMAT = "wav"
+# 캐시 전체 크기 제한 (초과 시 가장 오래 사용하지 않은 파일부터 삭제)
+CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+# 이보다 오래된 작성 중 임시 파일(.part)은 중단된 것으로 보고 삭제
+_STALE_PART_SECONDS = 3600
+
+MIME_TYPES = {
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "ogg": "audio/ogg",
+    "m4a": "audio/mp4"
+}
+
+
+def synthesis_key(*parts):
+    """엔진, 음성, 텍스트 등 합성 결과를 결정하는 값들의 해시"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _cache_path(key, fmt):
+    return os.path.join(CACHE_DIR, f"{key}.{fmt}")
+
+
+def _find_source(key):
+    """해당 키로 저장된 파일 중 변환 원본으로 쓸 경로 (WAV 우선, 없으면 None)"""
+    for fmt in [CANONICAL_FORMAT] + [f for f in MIME_TYPES if f != CANONICAL_FORMAT]:
+        path = _cache_path(key, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def has_audio(key):
+    """해당 키의 합성 결과가 어떤 형식으로든 저장되어 있는지 확인"""
+    return _find_source(key) is not None
+
+
+def _touch(path):
+    """최근 사용 시각 갱신 (LRU 정리 기준)"""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _prune(keep):
+    """캐시가 CACHE_MAX_BYTES를 넘으면 오래 사용하지 않은 파일부터 삭제"""
+    now = time.time()
+    entries = []
+    total = 0
+    for entry in os.scandir(CACHE_DIR):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        if ".part" in entry.name:
+            if now - stat.st_mtime > _STALE_PART_SECONDS:
+                _remove(entry.path)
+            continue
+        total += stat.st_size
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    if total <= CACHE_MAX_BYTES:
+        return
+    for _, size, path in sorted(entries):
+        if path == keep:
+            continue
+        _remove(path)
+        total -= size
+        if total <= CACHE_MAX_BYTES:
+            break
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_atomic(path, data):
+    """다른 세션이 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체"""
+    fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".part")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _copy_atomic(src_path, path):
+    """캐시 폴더 안의 임시 파일로 복사한 뒤 교체 (다른 파일 시스템의 원본도 원자적으로 반영)"""
+    fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".part")
+    os.close(fd)
+    try:
+        shutil.copyfile(src_path, temp_path)
+        os.replace(temp_path, path)
+    finally:
+        _remove(temp_path)
+
+
+def _transcode_atomic(src_path, dst_path):
+    """공유 프로세스 풀에서 변환한 뒤 완성된 파일만 캐시에 노출"""
+    ext = os.path.splitext(dst_path)[1]
+    fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=f".part{ext}")
+    os.close(fd)
+    try:
+        run_in_pool(transcode, src_path, temp_path)
+        os.replace(temp_path, dst_path)
+    finally:
+        _remove(temp_path)
+    return dst_path
+
+
+def store_audio(key, audio_bytes=None, source_path=None, source_format=CANONICAL_FORMAT):
+    """합성 결과를 엔진이 만든 형식 그대로 캐시에 저장하고 경로 반환
+
+    audio_bytes 대신 source_path를 주면 파일을 캐시로 옮기고 원본은 삭제함.
+    다른 형식(gTTS MP3의 WAV 등)은 get_audio_path에서 필요할 때만 변환함.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(key, source_format)
+    if audio_bytes is not None:
+        _write_atomic(path, audio_bytes)
+    else:
+        _copy_atomic(source_path, path)
+        _remove(source_path)
+    _prune(keep=path)
+    return path
+
+
+def get_audio_path(key, fmt):
+    """요청한 형식의 오디오 파일 경로 반환 (없으면 저장된 원본에서 변환 후 캐시)"""
+    path = _cache_path(key, fmt)
+    if os.path.exists(path):
+        _touch(path)
+        return path
+
+    source_path = _find_source(key)
+    if source_path is None:
+        raise FileNotFoundError(f"캐시에 합성 결과가 없습니다: {key}")
+    _touch(source_path)
+    _transcode_atomic(source_path, path)
+    _prune(keep=path)
+    return path
+
+
+def open_audio(key, fmt):
+    """요청한 형식의 오디오 파일을 열어 반환
+
+    경로를 받은 직후 다른 세션의 _prune이 파일을 지웠다면 캐시 미스로 보고 한 번 더 시도함.
+    열린 파일은 이후 삭제되어도 끝까지 읽을 수 있음.
+    """
+    try:
+        return open(get_audio_path(key, fmt), "rb")
+    except FileNotFoundError:
+        return open(get_audio_path(key, fmt), "rb")
+
+
+def get_audio(key, fmt):
+    """요청한 형식의 오디오 바이트 반환"""
+    with open_audio(key, fmt) as f:
+        return f.read()
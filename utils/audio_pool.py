@@ -0,0 +1,124 @@
+import os
+import threading
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# 워커 수는 CPU 코어 수, 대기열 깊이는 워커 수의 두 배로 제한
+MAX_WORKERS = int(os.getenv("AUDIO_POOL_WORKERS", os.cpu_count() or 2))
+MAX_PENDING = int(os.getenv("AUDIO_POOL_MAX_PENDING", MAX_WORKERS * 2))
+# 대기열 자리를 기다리는 최대 시간(초)
+SUBMIT_TIMEOUT = float(os.getenv("AUDIO_POOL_SUBMIT_TIMEOUT", 10))
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_PENDING)
+
+
+class AudioPoolBusyError(RuntimeError):
+    """오디오 처리 대기열이 가득 찼을 때 발생"""
+
+
+class FFmpegNotFoundError(RuntimeError):
+    """ffmpeg 실행 파일을 찾을 수 없을 때 발생"""
+
+    def __init__(self, message="ffmpeg를 찾을 수 없습니다. ffmpeg를 설치하고 PATH에 추가해주세요."):
+        super().__init__(message)
+
+
+def get_executor():
+    """모든 세션이 공유하는 프로세스 풀 반환 (최초 호출 시 생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Streamlit 서버는 멀티스레드이므로 fork 대신 spawn 사용
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def _reset_executor():
+    """워커가 비정상 종료된 풀을 폐기하여 다음 요청 때 새로 생성되도록 함"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def run_in_pool(fn, *args, timeout=None):
+    """CPU 작업을 공유 프로세스 풀에서 실행하고 결과를 반환
+
+    오디오 데이터는 디스크의 파일 경로로 넘겨 프로세스 간 복사를 피함.
+    대기열이 SUBMIT_TIMEOUT 동안 비지 않으면 AudioPoolBusyError 발생.
+    """
+    if not _slots.acquire(timeout=SUBMIT_TIMEOUT):
+        raise AudioPoolBusyError("오디오 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+    try:
+        future = get_executor().submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=timeout)
+    except BrokenProcessPool:
+        _reset_executor()
+        raise
+
+
+# ---- 워커 프로세스에서 실행되는 함수 (streamlit에 의존하지 않아야 함) ----
+
+def convert_to_wav(input_path, wav_path, channels=1, frame_rate=16000):
+    """pydub으로 디코딩 및 리샘플링하여 WAV 파일로 저장"""
+    from pydub import AudioSegment
+
+    try:
+        audio = AudioSegment.from_file(input_path)
+    except FileNotFoundError:
+        # 입력 파일이 있는데 FileNotFoundError가 나면 디코더(ffmpeg)가 없는 것
+        if not os.path.exists(input_path):
+            raise
+        raise FFmpegNotFoundError()
+    audio = audio.set_channels(channels)
+    audio = audio.set_frame_rate(frame_rate)
+    audio.export(wav_path, format='wav')
+    return wav_path
+
+
+def transcode(input_path, output_path):
+    """ffmpeg로 파일 형식 변환"""
+    try:
+        subprocess.run(
+            ['ffmpeg', '-y', '-i', input_path, output_path],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except subprocess.CalledProcessError as e:
+        # 키워드 인자는 피클링 시 유실되므로 위치 인자로 다시 생성
+        raise subprocess.CalledProcessError(e.returncode, e.cmd, e.output, e.stderr)
+    except FileNotFoundError:
+        raise FFmpegNotFoundError()
+    return output_path
+
+
+def recognize_google(wav_path, language, energy_threshold=4000, duration=0.5):
+    """환경 노이즈 보정, 오디오 읽기, Google 음성 인식을 한 워커에서 수행
+
+    PCM 데이터는 워커 안에서만 다루고 인식된 텍스트만 돌려보냄.
+    인식 실패 시 sr.UnknownValueError / sr.RequestError를 그대로 발생.
+    """
+    import speech_recognition as sr
+
+    r = sr.Recognizer()
+    r.dynamic_energy_threshold = True
+    r.energy_threshold = energy_threshold
+
+    with sr.AudioFile(wav_path) as source:
+        r.adjust_for_ambient_noise(source, duration=duration)
+        audio_data = r.record(source)
+    return r.recognize_google(audio_data, language=language)
@@ -0,0 +1,255 @@
+import os
+import hashlib
+import tempfile
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from typing import Iterator, Literal, Optional, Union
+from utils.audio_pool import run_in_pool, convert_to_wav, transcode, recognize_google
+from utils.transcript_index import TranscriptIndex
+
+# TTS/STT/요약 엔진 호출부 (streamlit에 의존하지 않고 실패 시 예외를 발생시킴)
+# 페이지는 이 함수들을 감싸 st.error로 보여주고, service.py는 HTTP 오류로 변환함
+
+SUMMARY_MODEL = "gpt-3.5-turbo"
+SUMMARY_TEMPERATURE = 0.7
+SUMMARY_MAX_TOKENS = 1000
+SUMMARY_SYSTEM_PROMPT = "You are a helpful assistant that specializes in summarizing meeting minutes in Korean."
+SUMMARY_CACHE_SIZE = 128
+SUMMARY_DEFAULT_PROMPT = (
+    "다음 회의록을 회사 회의용 형식으로 요약하세요. "
+    "주요 논의 사항, 결정된 사항, 후속 작업을 포함해 정리해 주세요."
+)
+
+# pyttsx3.init()은 프로세스 전체에서 엔진 하나를 공유하므로
+# 음성 설정부터 runAndWait까지는 한 세션씩만 실행
+pyttsx3_lock = threading.RLock()
+
+# Completed summaries shared across sessions, keyed by summary_cache_key()
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+class SpeechEngineError(Exception):
+    """음성 인식/합성 엔진이 결과를 만들지 못했을 때 발생"""
+
+
+# ---- TTS ----
+
+def get_pyttsx3_voices():
+    """사용 가능한 로컬 음성 목록 가져오기"""
+    import pyttsx3
+
+    with pyttsx3_lock:
+        engine = pyttsx3.init()
+        voices = engine.getProperty('voices')
+    return {f"local_{i}": voice for i, voice in enumerate(voices)}
+
+
+def text_to_speech_local(text, selected_voice, rate=150):
+    """pyttsx3를 사용하여 로컬 TTS 변환 후 WAV 파일로 저장
+
+    ffmpeg 변환 실패 시 subprocess.CalledProcessError 발생.
+    """
+    import pyttsx3
+
+    voices = get_pyttsx3_voices()
+    if selected_voice not in voices:
+        raise SpeechEngineError(f"알 수 없는 로컬 음성입니다: {selected_voice}")
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+        temp_filename = temp_file.name
+    with pyttsx3_lock:
+        engine = pyttsx3.init()
+
+        # 음성 설정
+        engine.setProperty('voice', voices[selected_voice].id)
+        engine.setProperty('rate', rate)
+
+        # 임시 파일에 저장
+        engine.save_to_file(text, temp_filename)
+        engine.runAndWait()
+
+    # ffmpeg를 사용하여 파일 변환 (호환성 문제 해결, 공유 프로세스 풀에서 실행)
+    converted_filename = temp_filename.replace('.wav', '_converted.wav')
+    try:
+        run_in_pool(transcode, temp_filename, converted_filename)
+    finally:
+        os.remove(temp_filename)  # 원본 임시 파일 삭제
+
+    return converted_filename
+
+
+def text_to_speech_gtts(text, lang='ko'):
+    """Google TTS를 사용하여 온라인 TTS 변환 후 메모리로 반환"""
+    from gtts import gTTS
+
+    tts = gTTS(text=text, lang=lang, slow=False)
+    audio_bytes = BytesIO()
+    tts.write_to_fp(audio_bytes)
+    return audio_bytes.getvalue()
+
+
+# ---- STT ----
+
+def convert_audio_to_wav(input_path):
+    """오디오 파일을 WAV 형식으로 변환"""
+    wav_path = input_path.rsplit('.', 1)[0] + '.wav'
+    # 디코딩/리샘플링(모노, 16kHz)은 공유 프로세스 풀에서 실행
+    return run_in_pool(convert_to_wav, input_path, wav_path, 1, 16000)
+
+
+def convert_audio_to_text(file_path, language):
+    """음성을 텍스트로 변환"""
+    import speech_recognition as sr
+
+    # 환경 노이즈 조정, 오디오 읽기, 음성 인식은 공유 프로세스 풀에서 실행
+    try:
+        return run_in_pool(recognize_google, file_path, language, 4000, 0.5)
+    except sr.UnknownValueError:
+        raise SpeechEngineError("음성을 인식할 수 없습니다. 다른 오디오 파일을 시도해주세요.")
+    except sr.RequestError as e:
+        raise SpeechEngineError(f"Google API 요청 실패: {str(e)}")
+
+
+def get_language_code(language: str) -> str:
+    """Get ISO language code from language name"""
+    return {
+        "한국어": "ko",
+        "영어": "en",
+        "스페인어": "es",
+        "프랑스어": "fr",
+        "독일어": "de",
+        "중국어": "zh",
+        "일본어": "ja"
+    }.get(language, "ko")  # 기본값을 'ko'로 변경
+
+
+def process_audio(
+    client,
+    audio_file,
+    transcription_type: Literal["번역", "타임스탬프 적용"],
+    language: str
+) -> Union[str, TranscriptIndex]:
+    """Process audio file based on selected options
+
+    Word timestamps are returned as a TranscriptIndex instead of one large string.
+    """
+    language_code = get_language_code(language)
+
+    # 한국어 음성을 영어로 번역하는 경우
+    if transcription_type == "번역" and language == "한국어":
+        response = client.audio.translations.create(
+            model="whisper-1",
+            file=audio_file,
+            response_format="text"
+        )
+    # 타임스탬프가 필요한 경우
+    elif transcription_type == "타임스탬프 적용":
+        response = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio_file,
+            response_format="verbose_json",
+            timestamp_granularities=["word"],
+            language=language_code
+        )
+        return TranscriptIndex.from_words(response.words)
+    # 일반 전사의 경우
+    else:
+        response = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio_file,
+            response_format="text",
+            language=language_code
+        )
+
+    return response.text if hasattr(response, 'text') else str(response)
+
+
+# ---- 요약 ----
+
+def summary_cache_key(
+    transcript: str,
+    prompt: str,
+    model: str = SUMMARY_MODEL,
+    temperature: float = SUMMARY_TEMPERATURE
+) -> str:
+    """Hash the inputs that determine a summary"""
+    digest = hashlib.sha256()
+    for part in (transcript, prompt, model, repr(temperature)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_cached_summary(key: str) -> Optional[str]:
+    """Return a previously generated summary, if any"""
+    with _summary_cache_lock:
+        summary = _summary_cache.get(key)
+        if summary is not None:
+            _summary_cache.move_to_end(key)
+        return summary
+
+
+def cache_summary(key: str, summary: str):
+    """Store a completed summary, evicting the least recently used one"""
+    if not summary:
+        return
+    with _summary_cache_lock:
+        _summary_cache[key] = summary
+        _summary_cache.move_to_end(key)
+        while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+
+def build_summary_messages(transcript: str, prompt: str) -> list:
+    """Build chat messages for the summary request"""
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{prompt}\n\n{transcript}"}
+    ]
+
+
+def generate_summary(client, transcript: str, prompt: str) -> str:
+    """Generate summary using OpenAI Chat API"""
+    key = summary_cache_key(transcript, prompt)
+    cached = get_cached_summary(key)
+    if cached is not None:
+        return cached
+
+    response = client.chat.completions.create(
+        model=SUMMARY_MODEL,
+        messages=build_summary_messages(transcript, prompt),
+        temperature=SUMMARY_TEMPERATURE,
+        max_tokens=SUMMARY_MAX_TOKENS
+    )
+    summary = response.choices[0].message.content or ""
+    cache_summary(key, summary)
+    return summary
+
+
+def stream_summary(client, transcript: str, prompt: str) -> Iterator[str]:
+    """Yield summary tokens as they arrive and cache the completed summary"""
+    key = summary_cache_key(transcript, prompt)
+    cached = get_cached_summary(key)
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    stream = client.chat.completions.create(
+        model=SUMMARY_MODEL,
+        messages=build_summary_messages(transcript, prompt),
+        temperature=SUMMARY_TEMPERATURE,
+        max_tokens=SUMMARY_MAX_TOKENS,
+        stream=True
+    )
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        token = chunk.choices[0].delta.content
+        if token:
+            chunks.append(token)
+            yield token
+
+    cache_summary(key, "".join(chunks))
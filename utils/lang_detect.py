@@ -0,0 +1,181 @@
+import numpy as np
+
+# 문자 체계 분류 번호 (LATIN_ES/FR/DE는 해당 언어에서만 주로 쓰는 라틴 문자)
+OTHER, LATIN, LATIN_EXT, LATIN_ES, LATIN_FR, LATIN_DE = 0, 1, 2, 3, 4, 5
+GREEK, CYRILLIC, HEBREW, ARABIC, DEVANAGARI, THAI = 6, 7, 8, 9, 10, 11
+HANGUL, HIRAGANA, KATAKANA, HAN = 12, 13, 14, 15
+NUM_CLASSES = 16
+
+# (시작, 끝(포함), 분류)
+_SCRIPT_RANGES = [
+    (0x0041, 0x005A, LATIN),
+    (0x0061, 0x007A, LATIN),
+    (0x00C0, 0x024F, LATIN_EXT),
+    (0x1E00, 0x1EFF, LATIN_EXT),
+    (0x0370, 0x03FF, GREEK),
+    (0x1F00, 0x1FFF, GREEK),
+    (0x0400, 0x052F, CYRILLIC),
+    (0x0590, 0x05FF, HEBREW),
+    (0x0600, 0x06FF, ARABIC),
+    (0x0750, 0x077F, ARABIC),
+    (0x0900, 0x097F, DEVANAGARI),
+    (0x0E00, 0x0E7F, THAI),
+    (0x1100, 0x11FF, HANGUL),
+    (0x3130, 0x318F, HANGUL),
+    (0xA960, 0xA97F, HANGUL),
+    (0xAC00, 0xD7A3, HANGUL),
+    (0xD7B0, 0xD7FF, HANGUL),
+    (0x3040, 0x309F, HIRAGANA),
+    (0x30A0, 0x30FF, KATAKANA),
+    (0x31F0, 0x31FF, KATAKANA),
+    (0xFF66, 0xFF9F, KATAKANA),
+    (0x3400, 0x4DBF, HAN),
+    (0x4E00, 0x9FFF, HAN),
+    (0xF900, 0xFAFF, HAN),
+    (0x20000, 0x3134F, HAN)
+]
+
+# 라틴 문자 중 특정 언어를 가리키는 문자
+_LATIN_HINTS = {
+    LATIN_ES: "ñÑ¿¡áíóúÁÍÓÚ",
+    LATIN_FR: "èêçàùœâîôûëïÈÊÇÀÙŒÂÎÔÛËÏ",
+    LATIN_DE: "äöüßÄÖÜẞ"
+}
+
+# 분류 → 언어 코드 (라틴/한자/가나는 _decide에서 따로 판단)
+_SCRIPT_LANGUAGES = {
+    HANGUL: "ko",
+    CYRILLIC: "ru",
+    GREEK: "el",
+    HEBREW: "he",
+    ARABIC: "ar",
+    DEVANAGARI: "hi",
+    THAI: "th"
+}
+
+# 한글 음절과 한자/가나는 한 글자가 라틴 문자 여러 개(대략 한 단어)에 해당하므로
+# 점수 계산 시 가중치를 주어 영어 단어가 섞인 한국어/일본어/중국어 문장이 라틴으로 판단되지 않게 함
+_SYLLABIC_WEIGHT = 5
+
+# 특정 언어 문자가 라틴 문자의 1% 이상이고 최소 3자 이상일 때만 해당 언어로 판단
+# (영어 문장 속 고유명사 한두 개로 언어가 바뀌지 않도록 함)
+_LATIN_HINT_RATIO = 100
+_LATIN_HINT_MIN = 3
+
+LANGUAGE_NAMES = {
+    "ko": "한국어",
+    "en": "영어",
+    "ja": "일본어",
+    "zh": "중국어",
+    "es": "스페인어",
+    "fr": "프랑스어",
+    "de": "독일어",
+    "ru": "러시아어",
+    "el": "그리스어",
+    "he": "히브리어",
+    "ar": "아랍어",
+    "hi": "힌디어",
+    "th": "태국어"
+}
+
+
+def _build_table():
+    """모든 유니코드 코드 포인트의 분류표 (1.1MB, 최초 1회 생성)"""
+    table = np.zeros(0x110000, dtype=np.uint8)
+    for start, end, script in _SCRIPT_RANGES:
+        table[start:end + 1] = script
+    for script, chars in _LATIN_HINTS.items():
+        table[[ord(c) for c in chars]] = script
+    return table
+
+
+_TABLE = _build_table()
+
+
+def _encode(text):
+    """텍스트를 코드 포인트 배열로 변환 (복사 없이 UTF-32 버퍼를 그대로 사용)"""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _count(code_points):
+    return np.bincount(_TABLE[code_points], minlength=NUM_CLASSES)
+
+
+def count_scripts(text):
+    """분류별 문자 수를 한 번의 벡터 연산으로 계산"""
+    return _count(_encode(text))
+
+
+def _decide(counts, default):
+    counts = counts.astype(np.int64)
+    latin = int(counts[LATIN:LATIN_DE + 1].sum())
+    kana = int(counts[HIRAGANA] + counts[KATAKANA])
+    scores = {"cjk": (kana + int(counts[HAN])) * _SYLLABIC_WEIGHT}
+    for script, code in _SCRIPT_LANGUAGES.items():
+        scores[code] = int(counts[script])
+    scores["ko"] *= _SYLLABIC_WEIGHT
+    # 동점이면 라틴이 아닌 문자 체계를 우선함
+    scores["latin"] = latin
+
+    best = max(scores, key=scores.get)
+    if scores[best] == 0:
+        return default
+    if best == "cjk":
+        # 일본어 문장에는 한자와 함께 가나가 섞여 있음
+        return "ja" if kana * 20 >= kana + int(counts[HAN]) else "zh"
+    if best == "latin":
+        hints = {
+            "es": int(counts[LATIN_ES]),
+            "fr": int(counts[LATIN_FR]),
+            "de": int(counts[LATIN_DE])
+        }
+        hinted = max(hints, key=hints.get)
+        count = hints[hinted]
+        if count >= _LATIN_HINT_MIN and count * _LATIN_HINT_RATIO >= latin:
+            return hinted
+        return "en"
+    return best
+
+
+def detect_language(text, default="en"):
+    """텍스트의 언어 코드(ko, ja, zh, en, es, fr, de, ru 등)를 감지"""
+    return _decide(count_scripts(text), default)
+
+
+class IncrementalDetector:
+    """입력이 바뀔 때 달라진 구간만 다시 세어 언어를 감지
+
+    Streamlit에서 세션마다 하나씩 두고 매 실행마다 update()를 호출함.
+    """
+
+    def __init__(self, default="en"):
+        self.default = default
+        self.text = ""
+        self.code_points = np.empty(0, dtype=np.uint32)
+        self.counts = np.zeros(NUM_CLASSES, dtype=np.int64)
+        self.language = default
+
+    def update(self, text):
+        if text == self.text:
+            return self.language
+
+        new = _encode(text)
+        old = self.code_points
+        shortest = min(len(old), len(new))
+
+        # 앞뒤로 같은 구간을 제외한 가운데 부분만 다시 셈
+        mismatch = np.flatnonzero(old[:shortest] != new[:shortest])
+        prefix = int(mismatch[0]) if len(mismatch) else shortest
+        limit = shortest - prefix
+        if limit:
+            tail_mismatch = np.flatnonzero(old[len(old) - limit:][::-1] != new[len(new) - limit:][::-1])
+            suffix = int(tail_mismatch[0]) if len(tail_mismatch) else limit
+        else:
+            suffix = 0
+
+        self.counts -= _count(old[prefix:len(old) - suffix])
+        self.counts += _count(new[prefix:len(new) - suffix])
+        self.text = text
+        self.code_points = new
+        self.language = _decide(self.counts, self.default)
+        return self.language
@@ -0,0 +1,125 @@
+import numpy as np
+
+# 자막 내보내기 시 한 구간에 묶을 최대 단어 수와 최대 길이(초)
+CUE_MAX_WORDS = 10
+CUE_MAX_SECONDS = 5.0
+
+
+def _format_clock(seconds, separator):
+    """초를 HH:MM:SS{separator}mmm 형식으로 변환"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+class TranscriptIndex:
+    """단어별 타임스탬프를 시작 시간 순으로 정렬된 병렬 배열에 보관
+
+    화면에는 필요한 페이지만, 내보내기 형식(TXT/SRT/VTT)은 요청할 때만 만듦.
+    """
+
+    def __init__(self, starts, ends, words):
+        starts = np.asarray(starts, dtype=np.float64)
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order]
+        self.ends = np.asarray(ends, dtype=np.float64)[order]
+        self.words = [words[i] for i in order]
+        self._lowered = None
+
+    @classmethod
+    def from_words(cls, words):
+        """Whisper verbose_json 응답의 words 목록으로 인덱스 생성"""
+        starts = [float(word.start) for word in words]
+        ends = [float(word.end) for word in words]
+        texts = [getattr(word, "word", None) or word.text for word in words]
+        return cls(starts, ends, texts)
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def duration(self):
+        return float(self.ends.max()) if len(self) else 0.0
+
+    def plain_text(self):
+        """타임스탬프 없이 단어만 이어 붙인 텍스트 (요약 입력용)"""
+        return " ".join(self.words)
+
+    def locate(self, seconds):
+        """해당 시간에 말하고 있는(또는 직전) 단어의 위치"""
+        position = int(np.searchsorted(self.starts, seconds, side="right")) - 1
+        return min(max(position, 0), max(len(self) - 1, 0))
+
+    def time_range(self, start, end):
+        """[start, end] 구간에 시작하는 단어들의 위치 범위 (lo, hi)"""
+        lo = int(np.searchsorted(self.starts, start, side="left"))
+        hi = int(np.searchsorted(self.starts, end, side="right"))
+        return lo, hi
+
+    def search(self, query):
+        """검색어가 포함된 단어들의 위치 (대소문자 무시)"""
+        query = query.strip().lower()
+        if not query:
+            return np.empty(0, dtype=np.int64)
+        if self._lowered is None:
+            self._lowered = [word.lower() for word in self.words]
+        return np.fromiter(
+            (i for i, word in enumerate(self._lowered) if query in word),
+            dtype=np.int64
+        )
+
+    def lines(self, lo, hi):
+        """lo부터 hi 전까지 단어를 "[시작 - 끝] 단어" 형식의 줄로 반환"""
+        return [
+            f"[{start:.2f} - {end:.2f}] {word}"
+            for start, end, word in zip(
+                self.starts[lo:hi].tolist(), self.ends[lo:hi].tolist(), self.words[lo:hi]
+            )
+        ]
+
+    def page_count(self, page_size):
+        return max(1, -(-len(self) // page_size))
+
+    def page(self, page_number, page_size):
+        """1부터 시작하는 페이지 번호의 줄 목록"""
+        lo = (page_number - 1) * page_size
+        return self.lines(lo, lo + page_size)
+
+    def _cues(self):
+        """자막용으로 단어들을 짧은 구간으로 묶음"""
+        lo = 0
+        while lo < len(self):
+            hi = lo + 1
+            while (
+                hi < len(self)
+                and hi - lo < CUE_MAX_WORDS
+                and self.ends[hi] - self.starts[lo] <= CUE_MAX_SECONDS
+            ):
+                hi += 1
+            yield float(self.starts[lo]), float(self.ends[hi - 1]), " ".join(self.words[lo:hi])
+            lo = hi
+
+    def to_txt(self):
+        return "\n".join(self.lines(0, len(self)))
+
+    def to_srt(self):
+        blocks = []
+        for number, (start, end, text) in enumerate(self._cues(), start=1):
+            blocks.append(f"{number}\n{_format_clock(start, ',')} --> {_format_clock(end, ',')}\n{text}\n")
+        return "\n".join(blocks)
+
+    def to_vtt(self):
+        blocks = ["WEBVTT\n"]
+        for start, end, text in self._cues():
+            blocks.append(f"{_format_clock(start, '.')} --> {_format_clock(end, '.')}\n{text}\n")
+        return "\n".join(blocks)
+
+    def export(self, fmt):
+        """TXT/SRT/VTT 중 요청한 형식의 텍스트 생성"""
+        return {
+            "txt": self.to_txt,
+            "srt": self.to_srt,
+            "vtt": self.to_vtt
+        }[fmt]()